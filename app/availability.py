@@ -0,0 +1,80 @@
+from datetime import datetime
+from threading import Lock
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app import models
+
+# book_id -> cached forecast; bumped generation drops results computed before a write
+_cache: dict[int, dict] = {}
+_generation: dict[int, int] = {}
+_lock = Lock()
+
+
+def invalidate_availability(book_id: int) -> None:
+    with _lock:
+        _cache.pop(book_id, None)
+        _generation[book_id] = _generation.get(book_id, 0) + 1
+
+
+def _compute(db: Session, book_id: int) -> Optional[dict]:
+    book = db.query(models.Book).filter(models.Book.id == book_id).first()
+    if not book:
+        return None
+
+    queue_length = (
+        db.query(models.Reservation)
+        .filter(models.Reservation.book_id == book.id, models.Reservation.status == "pending")
+        .count()
+    )
+    # a new request waits behind everyone already queued
+    queue_position = queue_length + 1
+
+    next_available_at: Optional[datetime] = None
+    if book.available_copies < queue_position:
+        # copies come back in due order; pick the one this position would get
+        nth = queue_position - max(0, book.available_copies)
+        row = (
+            db.query(models.Borrow.due_at)
+            .filter(models.Borrow.book_id == book.id, models.Borrow.returned_at.is_(None))
+            .order_by(models.Borrow.due_at)
+            .offset(nth - 1)
+            .limit(1)
+            .first()
+        )
+        if row:
+            next_available_at = row.due_at
+
+    return {
+        "book_id": book.id,
+        "available_copies": book.available_copies,
+        "queue_length": queue_length,
+        "queue_position": queue_position,
+        "next_available_at": next_available_at,
+    }
+
+
+def get_availability(db: Session, book_id: int) -> Optional[dict]:
+    # read the generation before the book row, so a write landing in
+    # between is seen as a generation change and not cached
+    with _lock:
+        cached = _cache.get(book_id)
+        generation = _generation.get(book_id, 0)
+    if cached is None:
+        cached = _compute(db, book_id)
+        if cached is None:
+            return None
+        with _lock:
+            if _generation.get(book_id, 0) == generation:
+                _cache[book_id] = cached
+
+    # "now" is resolved per request so cached entries do not go stale
+    now = datetime.utcnow()
+    result = dict(cached)
+    if result["available_copies"] >= result["queue_position"]:
+        result["next_available_at"] = now
+    elif result["next_available_at"] is not None:
+        # overdue copies are expected back as soon as possible
+        result["next_available_at"] = max(result["next_available_at"], now)
+    return result
@@ -1,11 +1,25 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from sqlalchemy import inspect, or_
+from sqlalchemy.schema import CreateIndex
 from app.database import Base, engine, SessionLocal
 from app import models
 from app.security import hash_password
+from app.write_behind import write_behind
 
 from app.routers import auth, books, member, librarian
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    write_behind.start()
+    yield
+    # flush buffered feedback/audit rows before exit
+    write_behind.stop()
+
+
 app = FastAPI(title="Library Management System (Demo)",
+lifespan=lifespan,
 docs_url = "/docs",
 redoc_url = "/redoc",
 openapi_url = "/openapi.json",
@@ -13,6 +27,34 @@ openapi_url = "/openapi.json",
 # Create tables
 Base.metadata.create_all(bind=engine)
 
+# create_all does not alter existing tables: add the member search columns
+def add_user_search_columns():
+    columns = {c["name"] for c in inspect(engine).get_columns("users")}
+    with engine.begin() as conn:
+        for name in ("full_name_search", "email_search"):
+            if name not in columns:
+                conn.exec_driver_sql(f"ALTER TABLE users ADD COLUMN {name} VARCHAR NOT NULL DEFAULT ''")
+
+    db = SessionLocal()
+    try:
+        stale = db.query(models.User).filter(
+            or_(models.User.full_name_search == "", models.User.email_search == "")
+        ).all()
+        for u in stale:
+            u.full_name_search = models.search_key(u.full_name)
+            u.email_search = models.search_key(u.email)
+        db.commit()
+    finally:
+        db.close()
+
+add_user_search_columns()
+
+# create_all skips tables that already exist, so add any newer indexes too
+with engine.begin() as conn:
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            conn.execute(CreateIndex(index, if_not_exists=True))
+
 # Seed 1 librarian account (for demo)
 def seed_librarian():
     db = SessionLocal()
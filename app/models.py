@@ -1,9 +1,13 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, Index
+from sqlalchemy.orm import relationship, validates
 from datetime import datetime
 from app.database import Base
 
 
+def search_key(value: str) -> str:
+    # SQLite lower() only folds ASCII, so names are folded in Python instead
+    return value.casefold()
+
 
 class User(Base):
     __tablename__ = "users"
@@ -19,11 +23,25 @@ class User(Base):
     library_card_id = Column(String, unique=True, nullable=True)
     is_active = Column(Boolean, default=True, nullable=False)
 
+    # case-folded copies for member directory search, kept in sync below
+    full_name_search = Column(String, index=True, nullable=False, default="")
+    email_search = Column(String, index=True, nullable=False, default="")
+
     borrows = relationship("Borrow", back_populates="user")
     reservations = relationship("Reservation", back_populates="user")
     feedbacks = relationship("Feedback", back_populates="user")
     payments = relationship("Payment", back_populates="user")
 
+    @validates("full_name")
+    def _set_full_name_search(self, key, value):
+        self.full_name_search = search_key(value)
+        return value
+
+    @validates("email")
+    def _set_email_search(self, key, value):
+        self.email_search = search_key(value)
+        return value
+
 
 class Book(Base):
     __tablename__ = "books"
@@ -59,7 +77,7 @@ class Borrow(Base):
     __tablename__ = "borrows"
     id = Column(Integer, primary_key=True, index=True)
 
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), index=True, nullable=False)
     book_id = Column(Integer, ForeignKey("books.id"), nullable=False)
 
     issued_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -74,6 +92,11 @@ class Borrow(Base):
     user = relationship("User", back_populates="borrows")
     book = relationship("Book", back_populates="borrows")
 
+    # open borrows per book in due order (availability forecast)
+    __table_args__ = (
+        Index("ix_borrows_open_book_due", book_id, due_at, sqlite_where=returned_at.is_(None)),
+    )
+
 
 class Feedback(Base):
     __tablename__ = "feedbacks"
@@ -90,7 +113,7 @@ class Payment(Base):
     __tablename__ = "payments"
     id = Column(Integer, primary_key=True, index=True)
 
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), index=True, nullable=False)
     amount_cents = Column(Integer, nullable=False)
     reason = Column(String, default="fine", nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
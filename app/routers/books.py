@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from sqlalchemy import or_
 
 from app.database import get_db
 from app import models, schemas
+from app.availability import get_availability
 
 router = APIRouter(prefix="/books", tags=["Books"])
 
@@ -21,3 +22,11 @@ def search_books(q: str, db: Session = Depends(get_db)):
         .filter(or_(models.Book.title.like(pattern), models.Book.author.like(pattern), models.Book.isbn.like(pattern)))
         .all()
     )
+
+
+@router.get("/{book_id}/availability", response_model=schemas.BookAvailabilityOut)
+def book_availability(book_id: int, db: Session = Depends(get_db)):
+    availability = get_availability(db, book_id)
+    if availability is None:
+        raise HTTPException(status_code=404, detail="Book not found")
+    return availability
@@ -1,11 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
+from sqlalchemy import and_, or_, func
+from typing import Optional
 import secrets
 
 from app.database import get_db
 from app import models, schemas
 from app.routers.auth import require_librarian
 from app.security import hash_password
+from app.availability import invalidate_availability
 
 router = APIRouter(prefix="/librarian", tags=["Librarian"])
 
@@ -45,6 +48,7 @@ def update_book(book_id: int, payload: schemas.BookUpdate, db: Session = Depends
         book.available_copies = payload.available_copies
 
     db.commit()
+    invalidate_availability(book.id)
     db.refresh(book)
     return book
 
@@ -56,6 +60,7 @@ def delete_book(book_id: int, db: Session = Depends(get_db), librarian: models.U
         raise HTTPException(status_code=404, detail="Book not found")
     db.delete(book)
     db.commit()
+    invalidate_availability(book.id)
     return {"message": "deleted"}
 
 
@@ -77,6 +82,94 @@ def add_member(payload: schemas.UserCreate, db: Session = Depends(get_db), libra
     return u
 
 
+def _prefix_range(column, prefix: str):
+    # range instead of LIKE 'x%' so SQLite can walk the index
+    upper_bound = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    return and_(column >= prefix, column < upper_bound)
+
+
+@router.get("/members", response_model=schemas.MemberDirectoryPage)
+def member_directory(
+    q: Optional[str] = None,
+    mode: str = Query(default="prefix", pattern="^(prefix|contains)$"),
+    limit: int = Query(default=20, ge=1, le=100),
+    offset: int = Query(default=0, ge=0),
+    db: Session = Depends(get_db),
+    librarian: models.User = Depends(require_librarian),
+):
+    criteria = []
+    term = (q or "").strip()
+    if term:
+        key = models.search_key(term)
+        if mode == "prefix":
+            criteria.append(or_(
+                _prefix_range(models.User.full_name_search, key),
+                _prefix_range(models.User.email_search, key),
+                _prefix_range(models.User.library_card_id, term.upper()),
+            ))
+        else:
+            # substring match cannot use a b-tree index and scans users
+            criteria.append(or_(
+                models.User.full_name_search.contains(key, autoescape=True),
+                models.User.email_search.contains(key, autoescape=True),
+                models.User.library_card_id.contains(term.upper(), autoescape=True),
+            ))
+
+    total = db.query(func.count(models.User.id)).filter(*criteria).scalar()
+
+    # pick the page first so the aggregates below only touch these users
+    page_ids = [
+        uid for (uid,) in (
+            db.query(models.User.id)
+            .filter(*criteria)
+            .order_by(models.User.full_name_search, models.User.id)
+            .limit(limit)
+            .offset(offset)
+            .all()
+        )
+    ]
+    if not page_ids:
+        return {"total": total, "limit": limit, "offset": offset, "items": []}
+
+    open_loans = dict(
+        db.query(models.Borrow.user_id, func.count(models.Borrow.id))
+        .filter(models.Borrow.user_id.in_(page_ids), models.Borrow.returned_at.is_(None))
+        .group_by(models.Borrow.user_id)
+        .all()
+    )
+    fines = dict(
+        db.query(models.Borrow.user_id, func.sum(models.Borrow.fine_cents))
+        .filter(models.Borrow.user_id.in_(page_ids))
+        .group_by(models.Borrow.user_id)
+        .all()
+    )
+    paid = dict(
+        db.query(models.Payment.user_id, func.sum(models.Payment.amount_cents))
+        .filter(models.Payment.user_id.in_(page_ids))
+        .group_by(models.Payment.user_id)
+        .all()
+    )
+    users = {u.id: u for u in db.query(models.User).filter(models.User.id.in_(page_ids)).all()}
+    rows = [
+        (users[uid], open_loans.get(uid, 0), max(0, (fines.get(uid) or 0) - (paid.get(uid) or 0)))
+        for uid in page_ids
+    ]
+
+    items = []
+    for u, loans, fine_cents in rows:
+        items.append({
+            "id": u.id,
+            "full_name": u.full_name,
+            "email": u.email,
+            "role": u.role,
+            "library_card_id": u.library_card_id,
+            "is_active": u.is_active,
+            "open_loans": loans,
+            "outstanding_fine_cents": fine_cents,
+        })
+    return {"total": total, "limit": limit, "offset": offset, "items": items}
+
+
 @router.put("/members/{user_id}", response_model=schemas.UserOut)
 def update_member(user_id: int, payload: schemas.MemberUpdate, db: Session = Depends(get_db), librarian: models.User = Depends(require_librarian)):
     u = db.query(models.User).filter(models.User.id == user_id).first()
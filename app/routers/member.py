@@ -5,6 +5,8 @@ from datetime import datetime, timedelta
 from app.database import get_db
 from app import models, schemas
 from app.routers.auth import get_current_user
+from app.availability import invalidate_availability
+from app.write_behind import add_append_only
 
 router = APIRouter(prefix="/member", tags=["Member (User)"])
 
@@ -37,6 +39,7 @@ def reserve_book(payload: schemas.ReservationCreate, db: Session = Depends(get_d
     res = models.Reservation(user_id=user.id, book_id=book.id, status="pending")
     db.add(res)
     db.commit()
+    invalidate_availability(book.id)
     db.refresh(res)
     return res
 
@@ -68,6 +71,7 @@ def issue_book(payload: schemas.BorrowIssueIn, db: Session = Depends(get_db), us
 
     db.add(borrow)
     db.commit()
+    invalidate_availability(book.id)
     db.refresh(borrow)
     return borrow
 
@@ -93,6 +97,7 @@ def return_book(borrow_id: int, db: Session = Depends(get_db), user: models.User
         borrow.fine_cents = max(0, days_late) * FINE_PER_LATE_DAY_CENTS
 
     db.commit()
+    invalidate_availability(borrow.book_id)
     db.refresh(borrow)
     return borrow
 
@@ -118,6 +123,7 @@ def renew_book(borrow_id: int, db: Session = Depends(get_db), user: models.User
     borrow.renewed_count += 1
 
     db.commit()
+    invalidate_availability(borrow.book_id)
     db.refresh(borrow)
     return borrow
 
@@ -150,8 +156,9 @@ def pay_fine(payload: schemas.PaymentCreate, db: Session = Depends(get_db), user
 
 @router.post("/feedback", response_model=schemas.FeedbackOut)
 def feedback(payload: schemas.FeedbackCreate, db: Session = Depends(get_db), user: models.User = Depends(get_current_user)):
-    fb = models.Feedback(user_id=user.id, message=payload.message)
-    db.add(fb)
-    db.commit()
-    db.refresh(fb)
+    values = {"user_id": user.id, "message": payload.message, "created_at": datetime.utcnow()}
+    fb = add_append_only(db, models.Feedback, values)
+    if fb is None:
+        # still queued for write-behind, so there is no id yet
+        return {"id": None, **values}
     return fb
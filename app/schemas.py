@@ -52,6 +52,14 @@ class BookOut(BaseModel):
         from_attributes = True
 
 
+class BookAvailabilityOut(BaseModel):
+    book_id: int
+    available_copies: int
+    queue_length: int
+    queue_position: int
+    next_available_at: Optional[datetime] = None
+
+
 class ReservationCreate(BaseModel):
     book_id: int
 
@@ -96,7 +104,8 @@ class FeedbackCreate(BaseModel):
 
 
 class FeedbackOut(BaseModel):
-    id: int
+    # None while the row is still queued for write-behind
+    id: Optional[int] = None
     user_id: int
     message: str
     created_at: datetime
@@ -128,3 +137,21 @@ from pydantic import BaseModel
 
 class RoleUpdate(BaseModel):
     role: str  # "member" or "librarian"
+
+
+class MemberDirectoryRow(BaseModel):
+    id: int
+    full_name: str
+    email: EmailStr
+    role: str
+    library_card_id: Optional[str] = None
+    is_active: bool
+    open_loans: int
+    outstanding_fine_cents: int
+
+
+class MemberDirectoryPage(BaseModel):
+    total: int
+    limit: int
+    offset: int
+    items: List[MemberDirectoryRow]
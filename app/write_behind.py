@@ -0,0 +1,151 @@
+import logging
+import queue
+import threading
+import time
+from typing import Optional
+
+from sqlalchemy import insert
+from sqlalchemy.exc import OperationalError
+
+from app.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# "sync"    -> insert in the request's own transaction (record is durable on response)
+# "batched" -> queue the insert; it is durable after the next flush
+DURABILITY_MODE = "batched"
+MAX_QUEUE_SIZE = 1000
+FLUSH_BATCH_SIZE = 100
+FLUSH_INTERVAL_SECONDS = 1.0
+# retries for transient errors such as "database is locked": 0.5s, 1s, 2s, 4s, 8s
+FLUSH_RETRIES = 5
+RETRY_BACKOFF_SECONDS = 0.5
+
+
+# Buffers append-only rows (feedback, audit events) and inserts them in
+# batched transactions, so they do not each take the SQLite writer lock.
+# Rows are queued as (model, column values) and inserted with Core, never
+# as ORM objects: a failed COMMIT would leave flushed primary keys on the
+# objects, and a retry could then collide with rows inserted meanwhile.
+class WriteBehindQueue:
+    def __init__(self, maxsize: int = MAX_QUEUE_SIZE, batch_size: int = FLUSH_BATCH_SIZE,
+                 interval: float = FLUSH_INTERVAL_SECONDS):
+        self._queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self._batch_size = batch_size
+        self._interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # submit() and stop() agree on _accepting under this lock, so nothing
+        # is queued after the worker's final drain
+        self._lock = threading.Lock()
+        self._accepting = False
+
+    def start(self) -> None:
+        with self._lock:
+            if self._accepting:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+            self._thread.start()
+            self._accepting = True
+
+    def stop(self) -> None:
+        with self._lock:
+            if not self._accepting:
+                return
+            self._accepting = False
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    # False means the caller has to write the record itself
+    def submit(self, model, values: dict) -> bool:
+        with self._lock:
+            if not self._accepting or not self._thread.is_alive():
+                return False
+            try:
+                self._queue.put_nowait((model, dict(values)))
+            except queue.Full:
+                return False
+            return True
+
+    def _drain(self, limit: int) -> list:
+        batch = []
+        while len(batch) < limit:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            batch = []
+            deadline = time.monotonic() + self._interval
+            while len(batch) < self._batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self._stop.is_set():
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._flush(batch)
+        # flush on shutdown
+        while not self._queue.empty():
+            self._flush(self._drain(self._batch_size))
+
+    def _flush(self, batch: list) -> None:
+        if not batch:
+            return
+        try:
+            self._insert(batch)
+            return
+        except OperationalError:
+            logger.exception("write-behind flush failed after retries, dropped %d record(s)", len(batch))
+            return
+        except Exception:
+            logger.warning("write-behind batch of %d failed, retrying row by row", len(batch), exc_info=True)
+
+        # one bad row should not take the rest of the batch with it
+        for model, values in batch:
+            try:
+                self._insert([(model, values)])
+            except Exception:
+                logger.exception("write-behind insert failed, dropped %s %r", model.__name__, values)
+
+    def _insert(self, records: list) -> None:
+        rows_by_model: dict = {}
+        for model, values in records:
+            rows_by_model.setdefault(model, []).append(values)
+
+        # values carry no primary key, so every attempt gets fresh ids
+        for attempt in range(FLUSH_RETRIES + 1):
+            db = SessionLocal()
+            try:
+                for model, rows in rows_by_model.items():
+                    db.execute(insert(model), rows)
+                db.commit()
+                return
+            except OperationalError:
+                db.rollback()
+                if attempt == FLUSH_RETRIES:
+                    raise
+            finally:
+                db.close()
+            time.sleep(RETRY_BACKOFF_SECONDS * 2 ** attempt)
+
+
+write_behind = WriteBehindQueue()
+
+
+# None if queued; otherwise the row is committed on `db` right away and
+# returned ("sync" mode, worker not started, or queue full)
+def add_append_only(db, model, values: dict):
+    if DURABILITY_MODE == "batched" and write_behind.submit(model, values):
+        return None
+    record = model(**values)
+    db.add(record)
+    db.commit()
+    db.refresh(record)
+    return record